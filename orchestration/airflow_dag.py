@@ -0,0 +1,246 @@
+"""
+Airflow DAG for the YouTube pipeline.
+
+Extraction is fanned out per channel shard with dynamic task mapping, each
+raw partition is transformed and then validated by its own mapped tasks, and
+the warehouse build is gated by a sensor that checks partition _SUCCESS
+markers rather than the state of the upstream tasks. The analysis refresh
+follows the build, which marks its run_date partition when it succeeds.
+
+Partition layout under the data root (the data_root param, which defaults
+to PIPELINE_DATA_ROOT and may be a local path or an s3:// URI):
+
+    raw/{channels,videos}/run_date=YYYY-MM-DD/shard=NNN/*.json
+    staging/{channels,videos}/run_date=YYYY-MM-DD/shard=NNN/*.parquet
+    quality/{channels,videos}/run_date=YYYY-MM-DD/shard=NNN/*_report.json
+    quarantine/{channels,videos}/run_date=YYYY-MM-DD/shard=NNN/*.parquet
+    warehouse/*.parquet
+    warehouse/_partitions/run_date=YYYY-MM-DD/_SUCCESS
+    analysis/run_date=YYYY-MM-DD/*.parquet
+
+Run locally against the fake API backend with:
+
+    python orchestration/airflow_dag.py
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from airflow.decorators import dag, task  # noqa: E402
+from airflow.exceptions import AirflowFailException  # noqa: E402
+from airflow.operators.python import get_current_context  # noqa: E402
+
+from main import CHANNEL_IDS  # noqa: E402
+from analysis_run import refresh_analysis  # noqa: E402
+from extract.fetch_channels import chunk_list, fetch_channels  # noqa: E402
+from extract.fetch_videos import fetch_videos_for_channels  # noqa: E402
+from transform.transform_channels import transform_channels  # noqa: E402
+from transform.transform_videos import transform_videos  # noqa: E402
+from quality.data_quality import DataQualityError, check_channels, check_videos  # noqa: E402
+from load.load_to_warehouse import build_warehouse  # noqa: E402
+from utils import storage  # noqa: E402
+from utils.partitions import (  # noqa: E402
+    clear_run_date,
+    mark_success,
+    missing_partitions,
+    partition_dir,
+    previous_partition,
+)
+
+SHARD_SIZE = 2
+
+# YouTube API quota is shared, so cap concurrent extract calls per run
+MAX_PARALLEL_EXTRACTS = 4
+
+
+def _run_params() -> tuple[str, str]:
+    """Return (data_root, run_date) for the current task instance."""
+    context = get_current_context()
+    return context["params"]["data_root"], context["ds"]
+
+
+@dag(
+    dag_id="youtube_pipeline",
+    schedule="@daily",
+    start_date=datetime(2025, 1, 1),
+    catchup=False,
+    max_active_runs=1,
+    default_args={"retries": 2, "retry_delay": timedelta(minutes=5)},
+    params={
+        "data_root": os.getenv("PIPELINE_DATA_ROOT", str(PROJECT_ROOT / "data")),
+        "shard_size": SHARD_SIZE,
+        "max_videos_per_channel": None,
+        # {check name: "warn" | "quarantine" | "fail"}, see quality.data_quality
+        "dq_severity": {},
+    },
+    tags=["youtube"],
+)
+def youtube_pipeline():
+
+    @task
+    def plan_shards() -> list[dict]:
+        """
+        Split CHANNEL_IDS into shards, one mapped extract task each.
+
+        Shards are numbered by position, so a different shard_size or
+        channel list would renumber them. The run_date's staging, quality
+        and quarantine partitions are cleared first, so no shard folder
+        from an earlier run of the same date is read by the warehouse build.
+        """
+        if not CHANNEL_IDS:
+            raise RuntimeError(
+                "CHANNEL_IDS is empty. Add at least one YouTube channel ID in src/main.py."
+            )
+
+        data_root, run_date = _run_params()
+        clear_run_date(data_root, run_date)
+
+        shard_size = int(get_current_context()["params"]["shard_size"])
+        return [
+            {"shard": i, "channel_ids": batch}
+            for i, batch in enumerate(chunk_list(CHANNEL_IDS, shard_size))
+        ]
+
+    @task(max_active_tis_per_dagrun=MAX_PARALLEL_EXTRACTS)
+    def extract_channels(shard_spec: dict) -> dict:
+        data_root, run_date = _run_params()
+        out_dir = partition_dir(storage.join_uri(data_root, "raw", "channels"), run_date, shard_spec["shard"])
+        raw_file = fetch_channels(shard_spec["channel_ids"], run_date=run_date, output_dir=out_dir)
+        return {"shard": shard_spec["shard"], "raw_file": raw_file}
+
+    @task(max_active_tis_per_dagrun=MAX_PARALLEL_EXTRACTS)
+    def extract_videos(shard_spec: dict) -> dict:
+        data_root, run_date = _run_params()
+        out_dir = partition_dir(storage.join_uri(data_root, "raw", "videos"), run_date, shard_spec["shard"])
+        raw_file = fetch_videos_for_channels(
+            shard_spec["channel_ids"],
+            run_date=run_date,
+            max_videos_per_channel=get_current_context()["params"]["max_videos_per_channel"],
+            output_dir=out_dir,
+        )
+        return {"shard": shard_spec["shard"], "raw_file": raw_file}
+
+    @task
+    def transform_channels_partition(raw: dict) -> dict:
+        data_root, run_date = _run_params()
+        out_dir = partition_dir(storage.join_uri(data_root, "staging", "channels"), run_date, raw["shard"])
+        staging_path = transform_channels(
+            raw_file=raw["raw_file"],
+            output_path=storage.join_uri(out_dir, "channels.parquet"),
+        )
+        return {"shard": raw["shard"], "staging_path": staging_path}
+
+    @task
+    def transform_videos_partition(raw: dict) -> dict:
+        data_root, run_date = _run_params()
+        out_dir = partition_dir(storage.join_uri(data_root, "staging", "videos"), run_date, raw["shard"])
+        staging_path = transform_videos(
+            raw_file=raw["raw_file"],
+            output_path=storage.join_uri(out_dir, "videos.parquet"),
+        )
+        return {"shard": raw["shard"], "staging_path": staging_path}
+
+    # A failed check has already moved its partition to quarantine, so a
+    # retry could only fail on the missing staging file. Fail without
+    # retrying instead; other errors (e.g. storage) still retry.
+    @task
+    def check_channels_partition(staged: dict) -> dict:
+        data_root, run_date = _run_params()
+        try:
+            return check_channels(
+                staged["staging_path"],
+                previous_path=previous_partition(storage.join_uri(data_root, "staging", "channels"), run_date),
+                severity=get_current_context()["params"]["dq_severity"],
+            )
+        except DataQualityError as exc:
+            raise AirflowFailException(str(exc)) from exc
+
+    @task
+    def check_videos_partition(staged: dict) -> dict:
+        data_root, run_date = _run_params()
+        try:
+            return check_videos(
+                staged["staging_path"],
+                # Every channel snapshot, as build_warehouse joins against all of staging
+                channels_path=storage.join_uri(data_root, "staging", "channels"),
+                previous_path=previous_partition(storage.join_uri(data_root, "staging", "videos"), run_date),
+                severity=get_current_context()["params"]["dq_severity"],
+            )
+        except DataQualityError as exc:
+            raise AirflowFailException(str(exc)) from exc
+
+    # Runs once the checks are done whatever their state, then waits until
+    # every shard partition of the run_date has passed validation. A failed
+    # shard can be cleared and re-run without restarting the whole DAG run.
+    @task.sensor(
+        poke_interval=60,
+        timeout=60 * 60,
+        mode="reschedule",
+        trigger_rule="all_done",
+    )
+    def validated_partitions_complete(shards: list[dict]) -> bool:
+        data_root, run_date = _run_params()
+        shard_ids = [s["shard"] for s in shards]
+
+        missing = missing_partitions(
+            storage.join_uri(data_root, "quality", "channels"), run_date, shard_ids
+        ) + missing_partitions(storage.join_uri(data_root, "quality", "videos"), run_date, shard_ids)
+
+        if missing:
+            print(f"[sensor] Waiting for {len(missing)} validated partitions: {missing}")
+        return not missing
+
+    @task
+    def build_warehouse_partition() -> str:
+        data_root, run_date = _run_params()
+        warehouse_dir = storage.join_uri(data_root, "warehouse")
+
+        build_warehouse(
+            staging_channels_path=storage.join_uri(data_root, "staging", "channels"),
+            staging_videos_path=storage.join_uri(data_root, "staging", "videos"),
+            warehouse_dir=warehouse_dir,
+        )
+        return mark_success(partition_dir(storage.join_uri(warehouse_dir, "_partitions"), run_date))
+
+    @task
+    def refresh_analysis_partition() -> list[str]:
+        data_root, run_date = _run_params()
+        return refresh_analysis(
+            warehouse_dir=storage.join_uri(data_root, "warehouse"),
+            output_dir=partition_dir(storage.join_uri(data_root, "analysis"), run_date),
+        )
+
+    shards = plan_shards()
+
+    staged_channels = transform_channels_partition.expand(
+        raw=extract_channels.expand(shard_spec=shards)
+    )
+    staged_videos = transform_videos_partition.expand(
+        raw=extract_videos.expand(shard_spec=shards)
+    )
+
+    checked_channels = check_channels_partition.expand(staged=staged_channels)
+    checked_videos = check_videos_partition.expand(staged=staged_videos)
+    # The orphan check reads the validated channel partitions
+    checked_channels >> checked_videos
+
+    validated = validated_partitions_complete(shards)
+    [checked_channels, checked_videos] >> validated
+
+    # The build writes the warehouse _SUCCESS marker itself, so the refresh
+    # only needs the build to have succeeded
+    validated >> build_warehouse_partition() >> refresh_analysis_partition()
+
+
+youtube_pipeline_dag = youtube_pipeline()
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("YT_API_BACKEND", "fake")
+    youtube_pipeline_dag.test()
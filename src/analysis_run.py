@@ -1,45 +1,54 @@
 import duckdb
 from pathlib import Path
 
-WAREHOUSE_DIR = Path("data") / "warehouse"
-SQL_ANALYSIS_DIR = Path("sql") / "analysis"
+from utils import storage
 
+# Anchored to the repo so the queries resolve from any working directory
+SQL_ANALYSIS_DIR = Path(__file__).resolve().parent.parent / "sql" / "analysis"
+ANALYSIS_FILES = ["top_videos.sql", "growth_analysis.sql", "upload_strategy.sql"]
 
-def get_connection():
-    # In memory DB that reads Parquet directly
-    con = duckdb.connect(database=":memory:")
+
+def get_connection(warehouse_dir: str | None = None):
+    warehouse_dir = warehouse_dir or storage.data_uri("warehouse")
+
+    # In memory DB that reads Parquet directly, locally or from the object store
+    con = storage.duckdb_connect(warehouse_dir)
 
     # Register Parquet files as views
     con.execute(f"""
         CREATE VIEW dim_channel AS
-        SELECT * FROM '{WAREHOUSE_DIR / "dim_channel.parquet"}';
+        SELECT * FROM '{storage.join_uri(warehouse_dir, "dim_channel.parquet")}';
     """)
 
     con.execute(f"""
         CREATE VIEW dim_video AS
-        SELECT * FROM '{WAREHOUSE_DIR / "dim_video.parquet"}';
+        SELECT * FROM '{storage.join_uri(warehouse_dir, "dim_video.parquet")}';
     """)
 
     con.execute(f"""
         CREATE VIEW fct_channel_daily_stats AS
-        SELECT * FROM '{WAREHOUSE_DIR / "fct_channel_daily_stats.parquet"}';
+        SELECT * FROM '{storage.join_uri(warehouse_dir, "fct_channel_daily_stats.parquet")}';
     """)
 
     con.execute(f"""
         CREATE VIEW fct_video_daily_stats AS
-        SELECT * FROM '{WAREHOUSE_DIR / "fct_video_daily_stats.parquet"}';
+        SELECT * FROM '{storage.join_uri(warehouse_dir, "fct_video_daily_stats.parquet")}';
     """)
 
     return con
 
 
-def run_sql_file(con: duckdb.DuckDBPyConnection, filename: str):
+def read_sql_file(filename: str) -> tuple[Path, str]:
     sql_path = SQL_ANALYSIS_DIR / filename
     if not sql_path.exists():
         raise FileNotFoundError(f"SQL file not found: {sql_path}")
 
     with sql_path.open("r", encoding="utf-8") as f:
-        query = f.read()
+        return sql_path, f.read()
+
+
+def run_sql_file(con: duckdb.DuckDBPyConnection, filename: str):
+    sql_path, query = read_sql_file(filename)
 
     print(f"\nRunning query from {sql_path}...")
     df = con.execute(query).fetch_df()
@@ -47,15 +56,36 @@ def run_sql_file(con: duckdb.DuckDBPyConnection, filename: str):
     print(f"Total rows: {len(df)}")
 
 
+def refresh_analysis(warehouse_dir: str, output_dir: str) -> list[str]:
+    """
+    Run every analysis query against warehouse_dir and save each result
+    as output_dir/<query name>.parquet.
+
+    Returns the written paths.
+    """
+    con = get_connection(warehouse_dir)
+
+    written: list[str] = []
+    for filename in ANALYSIS_FILES:
+        sql_path, query = read_sql_file(filename)
+        out_path = storage.join_uri(output_dir, sql_path.with_suffix(".parquet").name)
+
+        storage.write_parquet(con.execute(query).fetch_df(), out_path)
+        print(f"[analysis] Wrote {out_path}")
+        written.append(out_path)
+
+    con.close()
+    return written
+
+
 def main():
     con = get_connection()
 
     print("Tables available: dim_channel, dim_video, fct_channel_daily_stats, fct_video_daily_stats")
 
     # Run your analysis queries
-    run_sql_file(con, "top_videos.sql")
-    run_sql_file(con, "growth_analysis.sql")
-    run_sql_file(con, "upload_strategy.sql")
+    for filename in ANALYSIS_FILES:
+        run_sql_file(con, filename)
 
 
 if __name__ == "__main__":
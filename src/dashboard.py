@@ -0,0 +1,254 @@
+"""
+Streamlit dashboard over the warehouse, built on the sql/analysis queries.
+
+Run from the repo root with:
+
+    streamlit run src/dashboard.py
+
+One DuckDB connection is shared by every session, filter options, row
+counts and result pages are cached per warehouse fingerprint (so a rebuild
+invalidates them and reloads the page), and the channel and date filters
+are applied inside SQL before the analysis queries run.
+"""
+from datetime import date
+import math
+
+import pandas as pd
+import streamlit as st
+
+from analysis_run import ANALYSIS_FILES, get_connection, read_sql_file
+from utils import storage
+
+WAREHOUSE_TABLES = [
+    "dim_channel",
+    "dim_video",
+    "fct_channel_daily_stats",
+    "fct_video_daily_stats",
+]
+
+PAGE_SIZE = 50
+
+# How often the page re-checks the warehouse for a rebuild
+REFRESH_SECONDS = 30
+
+QUERY_CACHE_ENTRIES = 512
+
+
+@st.cache_resource
+def get_pooled_connection(warehouse_dir: str):
+    """One DuckDB connection per warehouse, shared by all sessions."""
+    return get_connection(warehouse_dir)
+
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def warehouse_fingerprint(warehouse_dir: str) -> str:
+    return storage.fingerprint(
+        [storage.join_uri(warehouse_dir, f"{table}.parquet") for table in WAREHOUSE_TABLES]
+    )
+
+
+def _filtered_query(query: str, channel_ids: tuple[str, ...], start_date: date, end_date: date) -> tuple[str, dict]:
+    """
+    Wrap an analysis query so the warehouse tables it reads are already
+    filtered.
+
+    CTEs named like the warehouse views shadow them inside the query, so
+    the SQL files run unmodified while DuckDB pushes the date predicates
+    into the Parquet scans and joins only the selected channels.
+    """
+    params: dict = {"start_date": start_date, "end_date": end_date}
+    channel_filter = ""
+    video_filter = ""
+    if channel_ids:
+        params["channel_ids"] = list(channel_ids)
+        channel_filter = "AND list_contains($channel_ids, channel_id)"
+        video_filter = """
+            AND video_key IN (
+                SELECT v.video_key
+                FROM main.dim_video v
+                JOIN main.dim_channel c ON v.channel_key = c.channel_key
+                WHERE list_contains($channel_ids, c.channel_id)
+            )"""
+
+    ctes = f"""
+        WITH
+        dim_channel AS (
+            SELECT * FROM main.dim_channel
+            WHERE TRUE {channel_filter}
+        ),
+        fct_channel_daily_stats AS (
+            SELECT * FROM main.fct_channel_daily_stats
+            WHERE snapshot_date BETWEEN $start_date AND $end_date
+        ),
+        fct_video_daily_stats AS (
+            SELECT * FROM main.fct_video_daily_stats
+            WHERE snapshot_date BETWEEN $start_date AND $end_date {video_filter}
+        )
+    """
+    # Trailing newline ends any '--' comment on the query's last line
+    body = query.strip().rstrip(";")
+    return f"{ctes} SELECT * FROM (\n{body}\n) AS q", params
+
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def count_query_rows(
+    warehouse_dir: str,
+    fingerprint: str,
+    filename: str,
+    channel_ids: tuple[str, ...],
+    start_date: date,
+    end_date: date,
+) -> int:
+    """
+    Total row count of an analysis query.
+
+    Cached without the page, so paging through a result only runs the
+    LIMIT/OFFSET query for each new page.
+    """
+    _, query = read_sql_file(filename)
+    sql, params = _filtered_query(query, channel_ids, start_date, end_date)
+
+    # Cursors share the pooled database and are safe to use per thread
+    cur = get_pooled_connection(warehouse_dir).cursor()
+    try:
+        return cur.execute(f"SELECT count(*) FROM ({sql})", params).fetchone()[0]
+    finally:
+        cur.close()
+
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def run_query_page(
+    warehouse_dir: str,
+    fingerprint: str,
+    filename: str,
+    channel_ids: tuple[str, ...],
+    start_date: date,
+    end_date: date,
+    page: int,
+) -> pd.DataFrame:
+    """
+    Return the rows of one page of an analysis query.
+
+    fingerprint is only part of the cache key: a rebuilt warehouse gets a
+    new fingerprint, so stale pages are never served.
+    """
+    _, query = read_sql_file(filename)
+    sql, params = _filtered_query(query, channel_ids, start_date, end_date)
+
+    cur = get_pooled_connection(warehouse_dir).cursor()
+    try:
+        return cur.execute(
+            f"{sql} LIMIT {PAGE_SIZE} OFFSET {page * PAGE_SIZE}", params
+        ).fetch_df()
+    finally:
+        cur.close()
+
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def load_filter_options(warehouse_dir: str, fingerprint: str) -> tuple[pd.DataFrame, date, date]:
+    """Channels and the snapshot date range available for filtering."""
+    cur = get_pooled_connection(warehouse_dir).cursor()
+    try:
+        channels = cur.execute(
+            "SELECT channel_id, channel_title FROM dim_channel ORDER BY channel_title"
+        ).fetch_df()
+        min_date, max_date = cur.execute(
+            "SELECT min(snapshot_date), max(snapshot_date) FROM fct_channel_daily_stats"
+        ).fetchone()
+    finally:
+        cur.close()
+    return channels, min_date, max_date
+
+
+def _render_query(
+    warehouse_dir: str,
+    fingerprint: str,
+    filename: str,
+    channel_ids: tuple[str, ...],
+    start_date: date,
+    end_date: date,
+):
+    page_key = f"page:{filename}"
+    page = st.session_state.get(page_key, 0)
+
+    total = count_query_rows(warehouse_dir, fingerprint, filename, channel_ids, start_date, end_date)
+    pages = max(1, math.ceil(total / PAGE_SIZE))
+    if page >= pages:
+        # Filters shrank the result, go back to the last page that exists
+        page = pages - 1
+        st.session_state[page_key] = page
+
+    df = run_query_page(warehouse_dir, fingerprint, filename, channel_ids, start_date, end_date, page)
+    st.dataframe(df, width="stretch", hide_index=True)
+
+    def _go_to(target: int):
+        st.session_state[page_key] = target
+
+    prev_col, info_col, next_col = st.columns([1, 3, 1])
+    prev_col.button(
+        "Previous", key=f"prev:{filename}", disabled=page == 0, on_click=_go_to, args=(page - 1,)
+    )
+    info_col.caption(f"Page {page + 1} of {pages} ({total} rows)")
+    next_col.button(
+        "Next", key=f"next:{filename}", disabled=page + 1 >= pages, on_click=_go_to, args=(page + 1,)
+    )
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def _watch_warehouse(warehouse_dir: str, loaded_fingerprint: str):
+    """
+    Rerun the whole page once the warehouse changes, so the filter options
+    and the results are reloaded together.
+    """
+    if warehouse_fingerprint(warehouse_dir) != loaded_fingerprint:
+        st.rerun()
+
+
+def main():
+    st.set_page_config(page_title="YouTube analytics", layout="wide")
+    st.title("YouTube analytics")
+
+    warehouse_dir = storage.data_uri("warehouse")
+    fingerprint = warehouse_fingerprint(warehouse_dir)
+    _watch_warehouse(warehouse_dir, fingerprint)
+
+    try:
+        channels, min_date, max_date = load_filter_options(warehouse_dir, fingerprint)
+    except Exception as exc:
+        st.error(f"Warehouse not available at {warehouse_dir}: {exc}")
+        st.stop()
+
+    if channels.empty or min_date is None:
+        st.info(f"The warehouse at {warehouse_dir} has no data yet. This page refreshes after the next build.")
+        st.stop()
+
+    with st.sidebar:
+        titles = dict(zip(channels["channel_id"], channels["channel_title"]))
+        selected = st.multiselect(
+            "Channels",
+            options=list(titles),
+            format_func=lambda channel_id: titles[channel_id],
+            help="Leave empty for all channels",
+        )
+        date_range = st.date_input(
+            "Snapshot dates",
+            value=(min_date, max_date),
+            min_value=min_date,
+            max_value=max_date,
+        )
+
+    # The range picker returns a single date while the user is mid-selection
+    if not isinstance(date_range, tuple) or len(date_range) != 2:
+        st.info("Pick a start and an end date.")
+        st.stop()
+    start_date, end_date = date_range
+    channel_ids = tuple(sorted(selected))
+
+    labels = [filename.removesuffix(".sql").replace("_", " ").capitalize() for filename in ANALYSIS_FILES]
+    for filename, tab in zip(ANALYSIS_FILES, st.tabs(labels)):
+        with tab:
+            _render_query(warehouse_dir, fingerprint, filename, channel_ids, start_date, end_date)
+
+
+if __name__ == "__main__":
+    main()
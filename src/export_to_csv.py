@@ -1,24 +1,19 @@
-from pathlib import Path
-import pandas as pd
+from utils import storage
 
 
-WAREHOUSE_DIR = Path("data") / "warehouse"
-CSV_DIR = WAREHOUSE_DIR / "csv"
+def export_parquet_to_csv(parquet_name: str, warehouse_dir: str | None = None):
+    warehouse_dir = warehouse_dir or storage.data_uri("warehouse")
+    src = storage.join_uri(warehouse_dir, parquet_name)
+    dst = storage.join_uri(warehouse_dir, "csv", parquet_name.replace(".parquet", ".csv"))
 
-
-def export_parquet_to_csv(parquet_name: str):
-    src = WAREHOUSE_DIR / parquet_name
-    dst = CSV_DIR / (parquet_name.replace(".parquet", ".csv"))
-
-    if not src.exists():
+    if not storage.exists(src):
         raise FileNotFoundError(f"Parquet file not found: {src}")
 
     print(f"Reading {src}")
-    df = pd.read_parquet(src)
-    CSV_DIR.mkdir(parents=True, exist_ok=True)
+    df = storage.read_parquet(src)
 
     print(f"Writing {dst}")
-    df.to_csv(dst, index=False)
+    storage.write_csv(df, dst)
 
 
 def main():
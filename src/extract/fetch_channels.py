@@ -1,8 +1,8 @@
-from pathlib import Path
 from datetime import date
-import json
 from typing import List
 
+from utils import storage
+from utils.partitions import mark_success, partition_dir
 from utils.youtube_client import get_youtube_client
 
 
@@ -11,7 +11,11 @@ def chunk_list(items: List[str], size: int) -> List[List[str]]:
     return [items[i:i + size] for i in range(0, len(items), size)]
 
 
-def fetch_channels(channel_ids: List[str], run_date: str | None = None) -> Path:
+def fetch_channels(
+    channel_ids: List[str],
+    run_date: str | None = None,
+    output_dir: str | None = None,
+) -> str:
     """
     Fetch channel details for the given channel IDs and save raw JSON.
 
@@ -19,10 +23,12 @@ def fetch_channels(channel_ids: List[str], run_date: str | None = None) -> Path:
     ----------
     channel_ids : list of YouTube channel IDs
     run_date    : optional run date in YYYY-MM-DD format. Defaults to today.
+    output_dir  : optional partition URI to write into.
+                  Defaults to <data root>/raw/channels/run_date=YYYY-MM-DD.
 
     Returns
     -------
-    Path to the written JSON file.
+    URI of the written JSON file.
     """
     if not channel_ids:
         raise ValueError("channel_ids list is empty")
@@ -45,13 +51,13 @@ def fetch_channels(channel_ids: List[str], run_date: str | None = None) -> Path:
         all_items.extend(items)
 
     # Prepare output path
-    output_dir = Path("data") / "raw" / "channels" / f"run_date={run_date}"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_dir is None:
+        output_dir = partition_dir(storage.data_uri("raw", "channels"), run_date)
 
-    output_path = output_dir / "channels.json"
+    output_path = storage.join_uri(output_dir, "channels.json")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(all_items, f, ensure_ascii=False, indent=2)
+    storage.write_json(all_items, output_path)
+    mark_success(output_dir)
 
     print(f"[channels] Saved {len(all_items)} channels to {output_path}")
     return output_path
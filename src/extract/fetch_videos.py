@@ -1,8 +1,8 @@
-from pathlib import Path
 from datetime import date
-import json
 from typing import List
 
+from utils import storage
+from utils.partitions import mark_success, partition_dir
 from utils.youtube_client import get_youtube_client
 
 
@@ -84,7 +84,8 @@ def fetch_videos_for_channels(
     channel_ids: List[str],
     run_date: str | None = None,
     max_videos_per_channel: int | None = None,
-) -> Path:
+    output_dir: str | None = None,
+) -> str:
     """
     For each channel, fetch all its videos and save raw JSON.
 
@@ -93,10 +94,12 @@ def fetch_videos_for_channels(
     channel_ids : list of channel IDs
     run_date    : YYYY-MM-DD, defaults to today
     max_videos_per_channel : optional limit to avoid huge downloads
+    output_dir  : optional partition URI to write into.
+                  Defaults to <data root>/raw/videos/run_date=YYYY-MM-DD.
 
     Returns
     -------
-    Path to the written JSON file
+    URI of the written JSON file
     """
     if not channel_ids:
         raise ValueError("channel_ids list is empty")
@@ -131,13 +134,13 @@ def fetch_videos_for_channels(
         all_video_items.extend(video_items)
 
     # Output
-    output_dir = Path("data") / "raw" / "videos" / f"run_date={run_date}"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_dir is None:
+        output_dir = partition_dir(storage.data_uri("raw", "videos"), run_date)
 
-    output_path = output_dir / "videos.json"
+    output_path = storage.join_uri(output_dir, "videos.json")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(all_video_items, f, ensure_ascii=False, indent=2)
+    storage.write_json(all_video_items, output_path)
+    mark_success(output_dir)
 
     print(f"[videos] Saved {len(all_video_items)} videos to {output_path}")
     return output_path
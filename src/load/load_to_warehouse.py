@@ -1,47 +1,50 @@
-from pathlib import Path
-
 import pandas as pd
 
-
-def _ensure_warehouse_dir() -> Path:
-    warehouse_dir = Path("data") / "warehouse"
-    warehouse_dir.mkdir(parents=True, exist_ok=True)
-    return warehouse_dir
+from utils import storage
 
 
-def build_warehouse() -> None:
+def _read_staging(uri: str) -> pd.DataFrame:
     """
-    Build dimension and fact tables from staging data and save to warehouse.
+    Read a staging table from a single Parquet file or from a directory
+    of run_date=.../shard=... partitions.
+    """
+    print(f"[warehouse] Reading {uri}")
+    return storage.read_parquet(uri)
 
-    Reads:
-        data/staging/channels/channels.parquet
-        data/staging/videos/videos.parquet
 
-    Writes:
-        data/warehouse/dim_channel.parquet
-        data/warehouse/dim_video.parquet
-        data/warehouse/fct_channel_daily_stats.parquet
-        data/warehouse/fct_video_daily_stats.parquet
+def build_warehouse(
+    staging_channels_path: str | None = None,
+    staging_videos_path: str | None = None,
+    warehouse_dir: str | None = None,
+) -> None:
     """
-    staging_channels_path = Path("data") / "staging" / "channels" / "channels.parquet"
-    staging_videos_path = Path("data") / "staging" / "videos" / "videos.parquet"
+    Build dimension and fact tables from staging data and save to warehouse.
 
-    if not staging_channels_path.exists():
-        raise FileNotFoundError(f"Staging channels file not found: {staging_channels_path}")
-    if not staging_videos_path.exists():
-        raise FileNotFoundError(f"Staging videos file not found: {staging_videos_path}")
+    Reads (a Parquet file or a directory of partitions each):
+        staging_channels_path, default every partition under <data root>/staging/channels
+        staging_videos_path,   default every partition under <data root>/staging/videos
 
-    print(f"[warehouse] Reading {staging_channels_path}")
-    ch = pd.read_parquet(staging_channels_path)
+    Writes to warehouse_dir, default <data root>/warehouse:
+        dim_channel.parquet
+        dim_video.parquet
+        fct_channel_daily_stats.parquet
+        fct_video_daily_stats.parquet
+    """
+    staging_channels_path = staging_channels_path or storage.data_uri("staging", "channels")
+    staging_videos_path = staging_videos_path or storage.data_uri("staging", "videos")
+    warehouse_dir = warehouse_dir or storage.data_uri("warehouse")
 
-    print(f"[warehouse] Reading {staging_videos_path}")
-    vd = pd.read_parquet(staging_videos_path)
+    ch = _read_staging(staging_channels_path)
+    vd = _read_staging(staging_videos_path)
 
     # Ensure snapshot_date is datetime.date
     ch["snapshot_date"] = pd.to_datetime(ch["snapshot_date"]).dt.date
     vd["snapshot_date"] = pd.to_datetime(vd["snapshot_date"]).dt.date
 
-    warehouse_dir = _ensure_warehouse_dir()
+    # A snapshot may be staged more than once (e.g. a date re-run with other
+    # shards), keep one row per key per snapshot_date for the fact tables
+    ch = ch.drop_duplicates(subset=["channel_id", "snapshot_date"], keep="last")
+    vd = vd.drop_duplicates(subset=["video_id", "snapshot_date"], keep="last")
 
     # 1. dim_channel: one row per channel, latest snapshot
     ch_latest = (
@@ -63,8 +66,8 @@ def build_warehouse() -> None:
         ]
     ]
 
-    dim_channel_path = warehouse_dir / "dim_channel.parquet"
-    dim_channel.to_parquet(dim_channel_path, index=False)
+    dim_channel_path = storage.join_uri(warehouse_dir, "dim_channel.parquet")
+    storage.write_parquet(dim_channel, dim_channel_path)
     print(f"[warehouse] Wrote dim_channel ({len(dim_channel)} rows) to {dim_channel_path}")
 
     # 2. dim_video: one row per video, latest snapshot, with channel_key
@@ -97,8 +100,8 @@ def build_warehouse() -> None:
         ]
     ]
 
-    dim_video_path = warehouse_dir / "dim_video.parquet"
-    dim_video.to_parquet(dim_video_path, index=False)
+    dim_video_path = storage.join_uri(warehouse_dir, "dim_video.parquet")
+    storage.write_parquet(dim_video, dim_video_path)
     print(f"[warehouse] Wrote dim_video ({len(dim_video)} rows) to {dim_video_path}")
 
     # 3. fct_channel_daily_stats: one row per channel per snapshot_date
@@ -118,8 +121,8 @@ def build_warehouse() -> None:
         ]
     ].sort_values(["channel_key", "snapshot_date"])
 
-    fct_channel_path = warehouse_dir / "fct_channel_daily_stats.parquet"
-    fct_channel.to_parquet(fct_channel_path, index=False)
+    fct_channel_path = storage.join_uri(warehouse_dir, "fct_channel_daily_stats.parquet")
+    storage.write_parquet(fct_channel, fct_channel_path)
     print(
         f"[warehouse] Wrote fct_channel_daily_stats "
         f"({len(fct_channel)} rows) to {fct_channel_path}"
@@ -143,8 +146,8 @@ def build_warehouse() -> None:
         ]
     ].sort_values(["video_key", "snapshot_date"])
 
-    fct_video_path = warehouse_dir / "fct_video_daily_stats.parquet"
-    fct_video.to_parquet(fct_video_path, index=False)
+    fct_video_path = storage.join_uri(warehouse_dir, "fct_video_daily_stats.parquet")
+    storage.write_parquet(fct_video, fct_video_path)
     print(
         f"[warehouse] Wrote fct_video_daily_stats "
         f"({len(fct_video)} rows) to {fct_video_path}"
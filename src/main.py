@@ -4,7 +4,10 @@ from extract.fetch_channels import fetch_channels
 from extract.fetch_videos import fetch_videos_for_channels
 from transform.transform_channels import transform_channels
 from transform.transform_videos import transform_videos
+from quality.data_quality import check_channels, check_videos
 from load.load_to_warehouse import build_warehouse
+from utils import storage
+from utils.partitions import clear_run_date, previous_partition
 
 # Put the channel IDs you want to track here
 CHANNEL_IDS = [
@@ -37,7 +40,9 @@ def main():
     print(f"Channels raw file: {channels_path}")
     print(f"Videos raw file:   {videos_path}")
 
-    # Day 2: transformations
+    # Day 2: transformations, replacing anything already staged for run_date
+    # (e.g. by the Airflow DAG, which writes the same partitions)
+    clear_run_date(storage.get_data_root(), run_date)
     staging_channels_path = transform_channels()
     staging_videos_path = transform_videos()
 
@@ -45,6 +50,18 @@ def main():
     print(f"Channels staging file: {staging_channels_path}")
     print(f"Videos staging file:   {staging_videos_path}")
 
+    # Day 2: data quality checks on the new staging partitions
+    check_channels(
+        staging_channels_path,
+        previous_path=previous_partition(storage.data_uri("staging", "channels"), run_date),
+    )
+    check_videos(
+        staging_videos_path,
+        channels_path=storage.data_uri("staging", "channels"),
+        previous_path=previous_partition(storage.data_uri("staging", "videos"), run_date),
+    )
+    print("Data quality checks completed.")
+
     # Day 2: warehouse build
     build_warehouse()
     print("Warehouse build completed.")
@@ -0,0 +1,301 @@
+from datetime import datetime, timezone
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils import storage
+from utils.partitions import clear_success, mark_success
+
+SEVERITIES = ("warn", "quarantine", "fail")
+
+# Severity per check, overridable per call (and per DAG run via params)
+DEFAULT_SEVERITY = {
+    "null_keys": "quarantine",
+    "negative_counts": "quarantine",
+    "duplicate_keys": "quarantine",
+    "view_count_decrease": "warn",
+    "orphan_channel": "quarantine",
+}
+
+KEY_COLUMNS = {"channels": "channel_id", "videos": "video_id"}
+
+COUNT_COLUMNS = {
+    "channels": ["view_count", "subscriber_count", "video_count"],
+    "videos": ["view_count", "like_count", "comment_count", "favorite_count"],
+}
+
+SAMPLE_SIZE = 5
+
+
+class DataQualityError(RuntimeError):
+    """Raised when a check with severity 'fail' finds bad rows."""
+
+
+def _resolve_severity(overrides: dict | None) -> dict:
+    severity = dict(DEFAULT_SEVERITY)
+    for check, level in (overrides or {}).items():
+        if check not in DEFAULT_SEVERITY:
+            raise ValueError(f"Unknown data quality check: {check}")
+        if level not in SEVERITIES:
+            raise ValueError(f"Severity for {check} must be one of {SEVERITIES}, got {level!r}")
+        severity[check] = level
+    return severity
+
+
+def _sibling_uri(staging_path: str, area: str, suffix: str) -> str:
+    """
+    Map a staging URI to the same partition under another area, e.g.
+    <root>/staging/videos/run_date=X/shard=N/videos.parquet ->
+    <root>/quality/videos/run_date=X/shard=N/videos_report.json
+    """
+    head, sep, tail = staging_path.rpartition("/staging/")
+    if not sep:
+        raise ValueError(f"Not a staging path: {staging_path}")
+    return storage.join_uri(head, area, tail.removesuffix(".parquet") + suffix)
+
+
+def _check_masks(
+    table: str,
+    data: pa.Table,
+    previous: pa.Table | None,
+    channel_ids: pa.Array | None,
+) -> dict[str, np.ndarray | None]:
+    """
+    Evaluate every check as one boolean mask over data (True = bad row).
+
+    All checks are Arrow compute kernels over whole columns; None means
+    the check had no reference data and was skipped.
+    """
+    key = KEY_COLUMNS[table]
+    keys = data[key]
+    masks: dict[str, np.ndarray | None] = {}
+
+    def _to_mask(arr) -> np.ndarray:
+        return pc.fill_null(arr, False).to_numpy(zero_copy_only=False)
+
+    masks["null_keys"] = _to_mask(pc.is_null(keys))
+
+    negative = [pc.less(data[column], 0) for column in COUNT_COLUMNS[table]]
+    masks["negative_counts"] = np.logical_or.reduce([_to_mask(arr) for arr in negative])
+
+    # A partition holds a single snapshot_date, so unique keys (the usual
+    # case) rule out duplicates without building a per-row mask
+    if len(pc.unique(keys)) == data.num_rows:
+        masks["duplicate_keys"] = np.zeros(data.num_rows, dtype=bool)
+    else:
+        # The first copy of a duplicated key is kept, only the extras are flagged
+        subset = data.select([key, "snapshot_date"]).to_pandas()
+        masks["duplicate_keys"] = subset.duplicated(keep="first").to_numpy()
+
+    if previous is not None and previous.num_rows:
+        # Position of each key in the previous partition, null when new
+        positions = pc.index_in(keys, value_set=previous[key].combine_chunks())
+        prev_views = pc.take(previous["view_count"], positions)
+        masks["view_count_decrease"] = _to_mask(pc.less(data["view_count"], prev_views))
+    else:
+        masks["view_count_decrease"] = None
+
+    if table == "videos" and channel_ids is not None:
+        # Rows the left merges in build_warehouse would leave without a channel_key
+        known = pc.is_in(data["channel_id"], value_set=channel_ids)
+        masks["orphan_channel"] = _to_mask(pc.invert(known))
+    else:
+        masks["orphan_channel"] = None
+
+    return masks
+
+
+def _check_partition(
+    table: str,
+    staging_path: str,
+    previous_path: str | None,
+    channels_path: str | None,
+    severity: dict | None,
+) -> dict:
+    started = time.perf_counter()
+    levels = _resolve_severity(severity)
+    key = KEY_COLUMNS[table]
+
+    report_path = _sibling_uri(staging_path, "quality", "_report.json")
+    clear_success(storage.parent_uri(report_path))
+
+    data = storage.read_table(staging_path)
+
+    # A previous partition whose data failed validation was moved to
+    # quarantine, so there is nothing to compare against
+    if previous_path is not None and not storage.has_parquet(previous_path):
+        print(f"[data_quality] No Parquet data under {previous_path}, skipping view_count_decrease")
+        previous_path = None
+
+    previous = None
+    if previous_path is not None:
+        previous = storage.read_table(previous_path, columns=[key, "view_count"])
+
+    channel_ids = None
+    if channels_path is not None:
+        channel_ids = pc.unique(storage.read_table(channels_path, columns=["channel_id"])["channel_id"])
+
+    if data.num_rows:
+        masks = _check_masks(table, data, previous, channel_ids)
+    else:
+        # A valid empty partition, e.g. a shard whose channels have no
+        # public uploads: nothing to check, but it still counts as validated
+        masks = {check: None for check in DEFAULT_SEVERITY}
+
+    results = []
+    quarantine_checks = []
+    failed_checks = []
+    for check, mask in masks.items():
+        level = levels[check]
+        if mask is None:
+            results.append(
+                {"check": check, "severity": level, "status": "skipped", "failed_rows": 0, "sample": []}
+            )
+            continue
+
+        failed_rows = int(mask.sum())
+        if failed_rows == 0:
+            status = "passed"
+        elif level == "fail":
+            status = "failed"
+            failed_checks.append(check)
+        elif level == "quarantine":
+            status = "quarantined"
+            quarantine_checks.append(check)
+        else:
+            status = "warned"
+
+        sample = data[key].filter(mask).slice(0, SAMPLE_SIZE).to_pylist() if failed_rows else []
+        results.append(
+            {
+                "check": check,
+                "severity": level,
+                "status": status,
+                "failed_rows": failed_rows,
+                "sample": [None if v is None else str(v) for v in sample],
+            }
+        )
+
+    quarantined_rows = 0
+    quarantine_path = None
+    if quarantine_checks or failed_checks:
+        # Only now pay for a pandas copy, most partitions never get here
+        df = data.to_pandas()
+        flagged = quarantine_checks + failed_checks
+        flags = pd.DataFrame({check: masks[check] for check in flagged}, index=df.index)
+        # A failed check pulls the whole partition out of staging so a later
+        # warehouse build cannot pick it up; otherwise only the bad rows go
+        bad = pd.Series(True, index=df.index) if failed_checks else flags.any(axis=1)
+        quarantined_rows = int(bad.sum())
+
+        quarantined = df[bad].copy()
+        quarantined["dq_failed_checks"] = (flags[bad] @ (flags.columns + ",")).str.rstrip(",")
+
+        quarantine_path = _sibling_uri(staging_path, "quarantine", ".parquet")
+        storage.write_parquet(quarantined, quarantine_path)
+
+        if failed_checks:
+            storage.remove(staging_path)
+        else:
+            storage.write_parquet(df[~bad], staging_path)
+
+    if failed_checks:
+        status = "failed"
+    elif quarantine_checks:
+        status = "quarantined"
+    elif any(r["status"] == "warned" for r in results):
+        status = "warned"
+    else:
+        status = "passed"
+
+    report = {
+        "table": table,
+        "partition": staging_path,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "status": status,
+        "row_count": data.num_rows,
+        "quarantined_rows": quarantined_rows,
+        "quarantine_path": quarantine_path,
+        "previous_partition": previous_path,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "checks": results,
+    }
+
+    storage.write_json(report, report_path)
+    print(
+        f"[data_quality] {table}: {status}, {data.num_rows} rows, "
+        f"{quarantined_rows} quarantined, report at {report_path}"
+    )
+
+    if failed_checks:
+        raise DataQualityError(
+            f"{table} partition {staging_path} failed checks: {', '.join(failed_checks)}"
+        )
+
+    # Downstream sensors gate on validated partitions, not on staged ones
+    mark_success(storage.parent_uri(report_path))
+    return report
+
+
+def check_channels(
+    staging_path: str,
+    previous_path: str | None = None,
+    severity: dict | None = None,
+) -> dict:
+    """
+    Run data quality checks on one staging channels partition.
+
+    Parameters
+    ----------
+    staging_path  : staging Parquet file of the partition to check
+    previous_path : optional earlier partition, used for the
+                    view_count_decrease check (skipped when not given
+                    or when it holds no Parquet data)
+    severity      : optional {check: "warn" | "quarantine" | "fail"}
+                    overrides of DEFAULT_SEVERITY
+
+    Rows failing a "quarantine" check are moved to the matching path under
+    <data root>/quarantine/, and a JSON report is written under
+    <data root>/quality/, next to a _SUCCESS marker for the validated
+    partition. A failing "fail" check moves the whole partition to
+    quarantine and raises DataQualityError instead.
+
+    Returns
+    -------
+    The report as a dict.
+    """
+    return _check_partition("channels", staging_path, previous_path, None, severity)
+
+
+def check_videos(
+    staging_path: str,
+    channels_path: str | None = None,
+    previous_path: str | None = None,
+    severity: dict | None = None,
+) -> dict:
+    """
+    Run data quality checks on one staging videos partition.
+
+    Parameters
+    ----------
+    staging_path  : staging Parquet file of the partition to check
+    channels_path : optional staging channels the warehouse is built from,
+                    i.e. the whole partition directory since build_warehouse
+                    joins videos against every snapshot. Used for the
+                    orphan_channel check (skipped when not given)
+    previous_path : optional earlier partition, used for the
+                    view_count_decrease check (skipped when not given
+                    or when it holds no Parquet data)
+    severity      : optional {check: "warn" | "quarantine" | "fail"}
+                    overrides of DEFAULT_SEVERITY
+
+    Quarantine, reporting and failure behave as in check_channels.
+
+    Returns
+    -------
+    The report as a dict.
+    """
+    return _check_partition("videos", staging_path, previous_path, channels_path, severity)
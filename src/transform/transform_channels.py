@@ -1,56 +1,81 @@
-from pathlib import Path
 from datetime import datetime
-import json
 
 import pandas as pd
 
+from utils import storage
+from utils.partitions import mark_success, partition_dir, run_date_from_path
 
-def _get_latest_run_dir(base_path: Path) -> tuple[Path, str]:
+
+# Staging schema, also written when a partition has no rows
+STAGING_COLUMNS = [
+    "channel_id",
+    "channel_title",
+    "channel_description",
+    "channel_published_at",
+    "country",
+    "view_count",
+    "subscriber_count",
+    "hidden_subscriber_count",
+    "video_count",
+    "uploads_playlist_id",
+    "snapshot_date",
+]
+
+
+def _get_latest_run_dir(base_uri: str) -> tuple[str, str]:
     """
-    Find the latest 'run_date=YYYY-MM-DD' directory under base_path.
+    Find the latest 'run_date=YYYY-MM-DD' directory under base_uri.
 
-    Returns (path, run_date_str).
+    Returns (uri, run_date_str).
     """
-    if not base_path.exists():
-        raise FileNotFoundError(f"Base path does not exist: {base_path}")
+    if not storage.exists(base_uri):
+        raise FileNotFoundError(f"Base path does not exist: {base_uri}")
 
     run_dirs = [
-        p for p in base_path.iterdir()
-        if p.is_dir() and p.name.startswith("run_date=")
+        name for name in storage.list_dir_names(base_uri)
+        if name.startswith("run_date=")
     ]
     if not run_dirs:
-        raise FileNotFoundError(f"No run_date=... folders found under {base_path}")
+        raise FileNotFoundError(f"No run_date=... folders found under {base_uri}")
 
-    latest_dir = max(run_dirs, key=lambda p: p.name)
-    run_date = latest_dir.name.split("=", 1)[1]
-    return latest_dir, run_date
+    latest_dir = max(run_dirs)
+    run_date = latest_dir.split("=", 1)[1]
+    return storage.join_uri(base_uri, latest_dir), run_date
 
 
-def transform_channels() -> Path:
+def transform_channels(
+    raw_file: str | None = None,
+    output_path: str | None = None,
+) -> str:
     """
     Transform raw channel JSON into a clean tabular format and save as Parquet.
 
     Reads from:
-        data/raw/channels/run_date=YYYY-MM-DD/channels.json
+        raw_file, or <data root>/raw/channels/run_date=YYYY-MM-DD/channels.json
+        for the latest run_date when not given
 
     Writes to:
-        data/staging/channels/channels.parquet
+        output_path, or <data root>/staging/channels/run_date=YYYY-MM-DD/shard=000/channels.parquet
+        for the raw file's run_date when not given (the DAG's layout for a single shard)
+
+    The snapshot date is taken from the run_date=... component of the
+    raw file path, so any raw partition can be transformed independently.
 
     Returns
     -------
-    Path to the Parquet file.
+    URI of the Parquet file.
     """
-    raw_root = Path("data") / "raw" / "channels"
-    latest_dir, run_date = _get_latest_run_dir(raw_root)
-    raw_file = latest_dir / "channels.json"
+    if raw_file is None:
+        latest_dir, _ = _get_latest_run_dir(storage.data_uri("raw", "channels"))
+        raw_file = storage.join_uri(latest_dir, "channels.json")
+    run_date = run_date_from_path(raw_file)
 
-    if not raw_file.exists():
+    if not storage.exists(raw_file):
         raise FileNotFoundError(f"Raw channels file not found: {raw_file}")
 
     print(f"[transform_channels] Reading {raw_file}")
 
-    with raw_file.open("r", encoding="utf-8") as f:
-        raw_items = json.load(f)
+    raw_items = storage.read_json(raw_file)
 
     rows: list[dict] = []
     snapshot_date = datetime.strptime(run_date, "%Y-%m-%d").date()
@@ -77,7 +102,7 @@ def transform_channels() -> Path:
             }
         )
 
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(rows, columns=STAGING_COLUMNS)
 
     # Parse dates
     df["channel_published_at"] = pd.to_datetime(
@@ -85,11 +110,12 @@ def transform_channels() -> Path:
     )
 
     # Output path
-    out_dir = Path("data") / "staging" / "channels"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / "channels.parquet"
+    out_path = output_path or storage.join_uri(
+        partition_dir(storage.data_uri("staging", "channels"), run_date, 0), "channels.parquet"
+    )
 
-    df.to_parquet(out_path, index=False)
+    storage.write_parquet(df, out_path)
+    mark_success(storage.parent_uri(out_path))
     print(f"[transform_channels] Wrote {len(df)} rows to {out_path}")
 
     return out_path
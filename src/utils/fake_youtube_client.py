@@ -0,0 +1,113 @@
+import hashlib
+
+
+def _seed(value: str) -> int:
+    """Stable integer derived from a string, so fake data is reproducible."""
+    return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:8], 16)
+
+
+class _Request:
+    def __init__(self, response: dict):
+        self._response = response
+
+    def execute(self) -> dict:
+        return self._response
+
+
+class _Channels:
+    def list(self, part: str, id: str) -> _Request:
+        items = []
+        for channel_id in id.split(","):
+            seed = _seed(channel_id)
+            items.append(
+                {
+                    "id": channel_id,
+                    "snippet": {
+                        "title": f"Fake channel {channel_id[-6:]}",
+                        "description": f"Fake description for {channel_id}",
+                        "publishedAt": "2015-01-01T00:00:00Z",
+                        "country": "US",
+                    },
+                    "statistics": {
+                        "viewCount": str(1_000_000 + seed % 1_000_000),
+                        "subscriberCount": str(10_000 + seed % 10_000),
+                        "hiddenSubscriberCount": False,
+                        "videoCount": str(FakeYouTubeClient.VIDEOS_PER_CHANNEL),
+                    },
+                    "contentDetails": {
+                        "relatedPlaylists": {"uploads": "UU" + channel_id[2:]},
+                    },
+                }
+            )
+        return _Request({"items": items})
+
+
+class _PlaylistItems:
+    def list(self, part: str, playlistId: str, maxResults: int = 50, pageToken: str | None = None) -> _Request:
+        total = FakeYouTubeClient.VIDEOS_PER_CHANNEL
+        start = int(pageToken) if pageToken else 0
+        end = min(start + maxResults, total)
+
+        items = [
+            {"contentDetails": {"videoId": f"{playlistId[2:]}-{i:05d}"}}
+            for i in range(start, end)
+        ]
+        response: dict = {"items": items}
+        if end < total:
+            response["nextPageToken"] = str(end)
+        return _Request(response)
+
+
+class _Videos:
+    def list(self, part: str, id: str) -> _Request:
+        items = []
+        for video_id in id.split(","):
+            seed = _seed(video_id)
+            # Fake video IDs are "<channel id without UC>-<index>"
+            channel_suffix = video_id.rsplit("-", 1)[0]
+            items.append(
+                {
+                    "id": video_id,
+                    "snippet": {
+                        "channelId": "UC" + channel_suffix,
+                        "title": f"Fake video {video_id}",
+                        "description": "",
+                        "publishedAt": f"2024-{seed % 12 + 1:02d}-{seed % 28 + 1:02d}T12:00:00Z",
+                        "categoryId": "28",
+                    },
+                    "statistics": {
+                        "viewCount": str(seed % 500_000),
+                        "likeCount": str(seed % 20_000),
+                        "favoriteCount": "0",
+                        "commentCount": str(seed % 2_000),
+                    },
+                    "contentDetails": {
+                        "duration": f"PT{seed % 59 + 1}M{seed % 60}S",
+                        "definition": "hd",
+                        "caption": "false",
+                        "licensedContent": True,
+                    },
+                }
+            )
+        return _Request({"items": items})
+
+
+class FakeYouTubeClient:
+    """
+    Offline stand-in for the YouTube Data API client.
+
+    Implements the subset of resources the extract modules call
+    (channels, playlistItems, videos) and returns deterministic payloads,
+    so the pipeline and the Airflow DAG can run without an API key.
+    """
+
+    VIDEOS_PER_CHANNEL = 120
+
+    def channels(self) -> _Channels:
+        return _Channels()
+
+    def playlistItems(self) -> _PlaylistItems:
+        return _PlaylistItems()
+
+    def videos(self) -> _Videos:
+        return _Videos()
@@ -0,0 +1,94 @@
+from utils import storage
+
+SUCCESS_MARKER = "_SUCCESS"
+
+
+def partition_dir(base_uri: str, run_date: str, shard: int | None = None) -> str:
+    """
+    Return the URI of one partition under base_uri.
+
+    Layout is base_uri/run_date=YYYY-MM-DD[/shard=NNN].
+    """
+    uri = storage.join_uri(base_uri, f"run_date={run_date}")
+    if shard is not None:
+        uri = storage.join_uri(uri, f"shard={shard:03d}")
+    return uri
+
+
+def run_date_from_path(uri: str) -> str:
+    """Extract YYYY-MM-DD from the nearest 'run_date=...' component of uri."""
+    for part in reversed(str(uri).replace("\\", "/").split("/")):
+        if part.startswith("run_date="):
+            return part.split("=", 1)[1]
+    raise ValueError(f"No run_date=... component in path: {uri}")
+
+
+def mark_success(directory: str) -> str:
+    """Write the _SUCCESS marker that flags a partition as complete."""
+    marker = storage.join_uri(directory, SUCCESS_MARKER)
+    storage.touch(marker)
+    return marker
+
+
+def clear_success(directory: str) -> None:
+    """Remove the _SUCCESS marker of a partition that is being rewritten."""
+    marker = storage.join_uri(directory, SUCCESS_MARKER)
+    if storage.exists(marker):
+        storage.remove(marker)
+
+
+def clear_partition(base_uri: str, run_date: str) -> None:
+    """
+    Delete the run_date partition under base_uri, with all its shards, so
+    a re-run cannot leave shard folders from an earlier sharding behind.
+    """
+    uri = partition_dir(base_uri, run_date)
+    if storage.exists(uri):
+        storage.remove(uri, recursive=True)
+
+
+def clear_run_date(data_root: str, run_date: str) -> None:
+    """
+    Delete run_date's staging, quality and quarantine partitions of every
+    table, before the date is staged again.
+    """
+    for area in ("staging", "quality", "quarantine"):
+        for table in ("channels", "videos"):
+            clear_partition(storage.join_uri(data_root, area, table), run_date)
+
+
+def is_complete(directory: str) -> bool:
+    return storage.exists(storage.join_uri(directory, SUCCESS_MARKER))
+
+
+def missing_partitions(base_uri: str, run_date: str, shards: list[int]) -> list[str]:
+    """
+    Return the shard partitions of run_date that have no _SUCCESS marker yet.
+
+    An empty list means the run_date partition is complete.
+    """
+    return [
+        partition_dir(base_uri, run_date, shard)
+        for shard in shards
+        if not is_complete(partition_dir(base_uri, run_date, shard))
+    ]
+
+
+def previous_partition(base_uri: str, run_date: str) -> str | None:
+    """
+    Return the URI of the latest run_date partition under base_uri that is
+    older than run_date and still holds Parquet data, or None if there is
+    none. Partitions emptied by a failed data quality check are skipped.
+    """
+    if not storage.exists(base_uri):
+        return None
+
+    older = [
+        name for name in storage.list_dir_names(base_uri)
+        if name.startswith("run_date=") and name.split("=", 1)[1] < run_date
+    ]
+    for name in sorted(older, reverse=True):
+        uri = storage.join_uri(base_uri, name)
+        if storage.has_parquet(uri):
+            return uri
+    return None
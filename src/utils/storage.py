@@ -0,0 +1,273 @@
+"""
+Storage helpers over fsspec, so every stage can read and write either the
+local disk or an S3-compatible object store through one data root URI.
+
+The root comes from PIPELINE_DATA_ROOT (default "data", relative to the
+working directory), e.g.
+
+    PIPELINE_DATA_ROOT=s3://youtube-pipeline/data
+
+For a local MinIO or moto stand-in, point the S3 client at it with
+PIPELINE_S3_ENDPOINT_URL=http://localhost:9000 and the usual
+AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY variables. Without those, S3
+credentials come from the AWS credential chain (role, profile, SSO).
+"""
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from urllib.parse import urlparse
+
+import duckdb
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+# s3fs switches to a multipart upload once a write exceeds one block
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+MAX_PARALLEL_READS = 16
+
+S3_PROTOCOLS = ("s3", "s3a")
+
+
+def get_data_root() -> str:
+    """Return the configured data root URI, without a trailing slash."""
+    load_dotenv()
+    return os.getenv("PIPELINE_DATA_ROOT", "data").rstrip("/")
+
+
+def join_uri(base: str, *parts: str) -> str:
+    """Join URI components with '/', which works for local paths and s3:// alike."""
+    return "/".join([str(base).rstrip("/")] + [str(p).strip("/") for p in parts])
+
+
+def parent_uri(uri: str) -> str:
+    """URI of the directory containing uri."""
+    head, sep, _ = str(uri).rstrip("/").rpartition("/")
+    return head if sep else "."
+
+
+def data_uri(*parts: str) -> str:
+    """URI of parts under the configured data root."""
+    return join_uri(get_data_root(), *parts)
+
+
+def _storage_options(uri: str) -> dict:
+    scheme = urlparse(str(uri)).scheme
+    # Plain paths (including Windows drive letters) create parents on write
+    if scheme in ("", "file") or len(scheme) == 1:
+        return {"auto_mkdir": True}
+    if scheme not in S3_PROTOCOLS:
+        return {}
+
+    endpoint_url = os.getenv("PIPELINE_S3_ENDPOINT_URL")
+    if not endpoint_url:
+        return {}
+    return {"client_kwargs": {"endpoint_url": endpoint_url}}
+
+
+def get_filesystem(uri: str) -> tuple[fsspec.AbstractFileSystem, str]:
+    """Return (filesystem, path within that filesystem) for uri."""
+    return fsspec.core.url_to_fs(str(uri), **_storage_options(uri))
+
+
+def _is_local(fs: fsspec.AbstractFileSystem) -> bool:
+    protocols = (fs.protocol,) if isinstance(fs.protocol, str) else fs.protocol
+    return "file" in protocols
+
+
+def exists(uri: str) -> bool:
+    fs, path = get_filesystem(uri)
+    return fs.exists(path)
+
+
+def is_dir(uri: str) -> bool:
+    fs, path = get_filesystem(uri)
+    return fs.isdir(path)
+
+
+def list_dir_names(uri: str) -> list[str]:
+    """Names (not full paths) of the directories directly under uri."""
+    fs, path = get_filesystem(uri)
+    return [
+        entry["name"].rstrip("/").rsplit("/", 1)[-1]
+        for entry in fs.ls(path, detail=True)
+        if entry["type"] == "directory"
+    ]
+
+
+def fingerprint(uris: list[str]) -> str:
+    """
+    Cheap version token for a set of files, from metadata only (size plus
+    ETag or modification time), so callers can tell when any of them changed.
+    Missing files contribute a fixed marker.
+    """
+    parts = []
+    for uri in uris:
+        fs, path = get_filesystem(uri)
+        try:
+            info = fs.info(path)
+        except FileNotFoundError:
+            parts.append(f"{uri}:missing")
+            continue
+        version = info.get("ETag") or info.get("LastModified") or info.get("mtime")
+        parts.append(f"{uri}:{info.get('size')}:{version}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def touch(uri: str) -> None:
+    fs, path = get_filesystem(uri)
+    fs.touch(path)
+
+
+def remove(uri: str, recursive: bool = False) -> None:
+    fs, path = get_filesystem(uri)
+    fs.rm(path, recursive=recursive)
+
+
+def write_json(obj, uri: str) -> None:
+    """
+    Write obj as JSON to uri.
+
+    On object stores the file is streamed in MULTIPART_CHUNK_SIZE parts,
+    so large raw payloads go up as a multipart upload.
+    """
+    fs, path = get_filesystem(uri)
+    with fs.open(path, "w", encoding="utf-8", block_size=MULTIPART_CHUNK_SIZE) as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def read_json(uri: str):
+    fs, path = get_filesystem(uri)
+    with fs.open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_parquet(df: pd.DataFrame, uri: str) -> None:
+    fs, path = get_filesystem(uri)
+    with fs.open(path, "wb", block_size=MULTIPART_CHUNK_SIZE) as f:
+        df.to_parquet(f, index=False)
+
+
+def write_csv(df: pd.DataFrame, uri: str) -> None:
+    fs, path = get_filesystem(uri)
+    with fs.open(path, "w", encoding="utf-8", newline="", block_size=MULTIPART_CHUNK_SIZE) as f:
+        df.to_csv(f, index=False)
+
+
+def _parquet_files(fs: fsspec.AbstractFileSystem, path: str) -> list[str]:
+    return sorted(p for p in fs.find(path) if p.endswith(".parquet"))
+
+
+def has_parquet(uri: str) -> bool:
+    """True if uri is a Parquet file or a directory holding at least one."""
+    fs, path = get_filesystem(uri)
+    if not fs.exists(path):
+        return False
+    if not fs.isdir(path):
+        return path.endswith(".parquet")
+    return bool(_parquet_files(fs, path))
+
+
+def read_table(uri: str, columns: list[str] | None = None) -> pa.Table:
+    """
+    Read a single Parquet file, or every Parquet partition under a directory,
+    as one Arrow table.
+
+    Partitions are fetched concurrently, which hides per-object latency on
+    object stores, and concatenated in path order. Pass columns to read
+    only those column chunks.
+    """
+    fs, path = get_filesystem(uri)
+    if not fs.exists(path):
+        raise FileNotFoundError(f"Parquet path not found: {uri}")
+
+    if not fs.isdir(path):
+        return pq.read_table(path, columns=columns, filesystem=fs)
+
+    files = _parquet_files(fs, path)
+    if not files:
+        raise FileNotFoundError(f"No Parquet partitions found under {uri}")
+
+    def _read(file_path: str) -> pa.Table:
+        return pq.read_table(file_path, columns=columns, filesystem=fs)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_READS, len(files))) as pool:
+        tables = list(pool.map(_read, files))
+
+    # Partitions may disagree on types: count columns are int64 unless a
+    # value was missing (float64), and all-null columns come out as null.
+    # Permissive promotion widens them to a common type, as pd.concat would.
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def read_parquet(uri: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Same as read_table, converted to a pandas DataFrame."""
+    return read_table(uri, columns=columns).to_pandas()
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _duckdb_s3_secret_sql() -> str:
+    """
+    CREATE SECRET statement for DuckDB's S3 reader.
+
+    Static keys are used when AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY are
+    set, otherwise DuckDB resolves credentials through the AWS credential
+    chain (instance or task role, profile, SSO), like s3fs does.
+    """
+    key_id = os.getenv("AWS_ACCESS_KEY_ID")
+    secret = os.getenv("AWS_SECRET_ACCESS_KEY")
+    if key_id and secret:
+        options = {
+            "KEY_ID": _sql_literal(key_id),
+            "SECRET": _sql_literal(secret),
+        }
+        if os.getenv("AWS_SESSION_TOKEN"):
+            options["SESSION_TOKEN"] = _sql_literal(os.getenv("AWS_SESSION_TOKEN"))
+    else:
+        options = {"PROVIDER": "credential_chain"}
+
+    region = os.getenv("AWS_DEFAULT_REGION", os.getenv("AWS_REGION"))
+    if region:
+        options["REGION"] = _sql_literal(region)
+
+    endpoint = urlparse(os.getenv("PIPELINE_S3_ENDPOINT_URL", ""))
+    if endpoint.netloc:
+        # Stand-ins like MinIO and moto need path-style URLs
+        options["ENDPOINT"] = _sql_literal(endpoint.netloc)
+        options["URL_STYLE"] = "'path'"
+        options["USE_SSL"] = "true" if endpoint.scheme == "https" else "false"
+
+    settings = "".join(f", {key} {value}" for key, value in options.items())
+    return f"CREATE OR REPLACE SECRET pipeline_s3 (TYPE S3{settings})"
+
+
+def duckdb_connect(uri: str, database: str = ":memory:") -> duckdb.DuckDBPyConnection:
+    """
+    Return a DuckDB connection able to read Parquet under uri in place.
+
+    S3 URIs go through DuckDB's native httpfs reader. If that extension is
+    unavailable, the fsspec filesystem is registered with DuckDB instead.
+    """
+    con = duckdb.connect(database=database)
+
+    fs, _ = get_filesystem(uri)
+    if _is_local(fs):
+        return con
+
+    if urlparse(str(uri)).scheme in S3_PROTOCOLS:
+        try:
+            con.execute("INSTALL httpfs; LOAD httpfs;")
+            con.execute(_duckdb_s3_secret_sql())
+            return con
+        except duckdb.Error as exc:
+            print(f"[storage] DuckDB S3 reader unavailable ({exc}), falling back to fsspec")
+
+    con.register_filesystem(fs)
+    return con
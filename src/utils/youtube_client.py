@@ -7,10 +7,17 @@ def get_youtube_client():
     """
     Create and return an authenticated YouTube Data API client.
     Reads the API key from the YT_API_KEY environment variable or .env file.
+
+    Set YT_API_BACKEND=fake to get an offline client with deterministic
+    payloads instead (used for local runs and Airflow's dag.test()).
     """
     # Load .env file once
     load_dotenv()
 
+    if os.getenv("YT_API_BACKEND", "api").lower() == "fake":
+        from utils.fake_youtube_client import FakeYouTubeClient
+        return FakeYouTubeClient()
+
     api_key = os.getenv("YT_API_KEY")
     if not api_key:
         raise RuntimeError(
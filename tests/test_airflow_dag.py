@@ -0,0 +1,125 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("airflow")
+
+from airflow.models.mappedoperator import MappedOperator  # noqa: E402
+
+DAG_FILE = Path(__file__).resolve().parent.parent / "orchestration" / "airflow_dag.py"
+
+MAPPED_TASKS = [
+    "extract_channels",
+    "extract_videos",
+    "transform_channels_partition",
+    "transform_videos_partition",
+    "check_channels_partition",
+    "check_videos_partition",
+]
+
+
+@pytest.fixture(scope="module")
+def dag_module():
+    spec = importlib.util.spec_from_file_location("airflow_dag", DAG_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def dag(dag_module):
+    return dag_module.youtube_pipeline_dag
+
+
+def test_dag_imports(dag):
+    assert dag.dag_id == "youtube_pipeline"
+    assert set(dag.task_ids) == set(MAPPED_TASKS) | {
+        "plan_shards",
+        "validated_partitions_complete",
+        "build_warehouse_partition",
+        "refresh_analysis_partition",
+    }
+
+
+def test_partition_tasks_are_mapped(dag):
+    for task_id in MAPPED_TASKS:
+        assert isinstance(dag.get_task(task_id), MappedOperator), task_id
+
+    for task_id in ["plan_shards", "build_warehouse_partition", "refresh_analysis_partition"]:
+        assert not isinstance(dag.get_task(task_id), MappedOperator), task_id
+
+
+def test_mapping_chain(dag):
+    assert dag.get_task("extract_channels").upstream_task_ids == {"plan_shards"}
+    assert dag.get_task("extract_videos").upstream_task_ids == {"plan_shards"}
+    assert dag.get_task("transform_channels_partition").upstream_task_ids == {"extract_channels"}
+    assert dag.get_task("transform_videos_partition").upstream_task_ids == {"extract_videos"}
+    assert dag.get_task("check_channels_partition").upstream_task_ids == {"transform_channels_partition"}
+    # The orphan check reads the validated channel partitions
+    assert dag.get_task("check_videos_partition").upstream_task_ids == {
+        "transform_videos_partition",
+        "check_channels_partition",
+    }
+
+
+def test_warehouse_gated_on_validated_partitions(dag):
+    sensor = dag.get_task("validated_partitions_complete")
+    assert sensor.mode == "reschedule"
+    assert sensor.trigger_rule == "all_done"
+    assert {"check_channels_partition", "check_videos_partition"} <= sensor.upstream_task_ids
+
+    assert dag.get_task("build_warehouse_partition").upstream_task_ids == {"validated_partitions_complete"}
+    assert dag.get_task("refresh_analysis_partition").upstream_task_ids == {"build_warehouse_partition"}
+
+
+def test_dag_runs_against_fake_backend(dag, monkeypatch, tmp_path):
+    from airflow.settings import engine
+    from airflow.utils.state import DagRunState
+    from sqlalchemy import inspect
+
+    if not inspect(engine).has_table("task_instance"):
+        pytest.skip("Airflow metadata database not initialised, run 'airflow db migrate'")
+
+    monkeypatch.setenv("YT_API_BACKEND", "fake")
+    data_root = tmp_path / "data"
+
+    dag_run = dag.test(run_conf={"data_root": str(data_root), "max_videos_per_channel": 5})
+
+    assert dag_run.state == DagRunState.SUCCESS
+    assert (data_root / "warehouse" / "dim_channel.parquet").exists()
+    assert list((data_root / "analysis").glob("run_date=*/*.parquet"))
+    shards = sorted(p.name for p in (data_root / "staging" / "videos").glob("run_date=*/shard=*"))
+    assert len(shards) > 1
+
+    # Re-running the date with fewer shards must not leave the old ones behind
+    dag_run = dag.test(run_conf={"data_root": str(data_root), "max_videos_per_channel": 5, "shard_size": 100})
+
+    assert dag_run.state == DagRunState.SUCCESS
+    assert [p.name for p in (data_root / "staging" / "videos").glob("run_date=*/shard=*")] == ["shard=000"]
+    fct_video = pd.read_parquet(data_root / "warehouse" / "fct_video_daily_stats.parquet")
+    assert not fct_video.duplicated(["video_key", "snapshot_date"]).any()
+
+
+def test_main_after_dag_run_replaces_the_date(dag, monkeypatch, tmp_path):
+    from airflow.settings import engine
+    from sqlalchemy import inspect
+
+    if not inspect(engine).has_table("task_instance"):
+        pytest.skip("Airflow metadata database not initialised, run 'airflow db migrate'")
+
+    monkeypatch.setenv("YT_API_BACKEND", "fake")
+    data_root = tmp_path / "data"
+    monkeypatch.setenv("PIPELINE_DATA_ROOT", str(data_root))
+
+    dag.test(run_conf={"data_root": str(data_root), "max_videos_per_channel": 5})
+    dag_rows = len(pd.read_parquet(data_root / "warehouse" / "fct_channel_daily_stats.parquet"))
+
+    # Both entry points stage the same date into the same partitions
+    sys.modules["main"].main()
+
+    fct_channel = pd.read_parquet(data_root / "warehouse" / "fct_channel_daily_stats.parquet")
+    assert len(fct_channel) == dag_rows
+    assert [p.name for p in (data_root / "staging" / "channels").glob("run_date=*/shard=*")] == ["shard=000"]
@@ -0,0 +1,71 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from extract.fetch_channels import fetch_channels  # noqa: E402
+from extract.fetch_videos import fetch_videos_for_channels  # noqa: E402
+from load.load_to_warehouse import build_warehouse  # noqa: E402
+from transform.transform_channels import transform_channels  # noqa: E402
+from transform.transform_videos import transform_videos  # noqa: E402
+from utils import storage  # noqa: E402
+
+DASHBOARD = str(Path(__file__).resolve().parent.parent / "src" / "dashboard.py")
+
+
+def _build(channel_ids: list[str], run_date: str = "2025-01-01"):
+    fetch_channels(channel_ids, run_date=run_date)
+    fetch_videos_for_channels(channel_ids, run_date=run_date, max_videos_per_channel=3)
+    transform_channels()
+    transform_videos()
+    build_warehouse()
+
+
+@pytest.fixture
+def data_root(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_API_BACKEND", "fake")
+    monkeypatch.setenv("PIPELINE_DATA_ROOT", str(tmp_path / "data"))
+    return tmp_path / "data"
+
+
+def _run() -> AppTest:
+    return AppTest.from_file(DASHBOARD, default_timeout=60).run()
+
+
+def test_missing_warehouse(data_root):
+    at = _run()
+    assert not at.exception
+    assert "Warehouse not available" in at.error[0].value
+
+
+def test_empty_warehouse(data_root):
+    _build(["UC_channel_a"])
+    for table in ["dim_channel", "fct_channel_daily_stats"]:
+        uri = storage.data_uri("warehouse", f"{table}.parquet")
+        storage.write_parquet(storage.read_parquet(uri).iloc[0:0], uri)
+
+    at = _run()
+    assert not at.exception
+    assert "no data yet" in at.info[0].value
+
+
+def test_filters_follow_rebuild(data_root):
+    _build(["UC_channel_a"])
+
+    at = _run()
+    assert not at.exception
+    assert len(at.multiselect[0].options) == 1
+    assert len(at.tabs) == 3
+
+    _build(["UC_channel_a", "UC_channel_b"], run_date="2025-01-02")
+    # Stands in for the cached fingerprint expiring before the next poll
+    st.cache_data.clear()
+    at.run()
+
+    assert not at.exception
+    assert len(at.multiselect[0].options) == 2
+    assert at.date_input[0].value == (date(2025, 1, 1), date(2025, 1, 2))
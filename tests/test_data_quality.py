@@ -0,0 +1,238 @@
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from quality.data_quality import (
+    DataQualityError,
+    _check_masks,
+    check_channels,
+    check_videos,
+)
+from utils import storage
+from utils.partitions import SUCCESS_MARKER, mark_success, previous_partition
+
+
+def _videos(rows: list[tuple], run_date: str = "2025-01-02") -> pd.DataFrame:
+    """rows of (video_id, channel_id, view_count)"""
+    return pd.DataFrame(
+        {
+            "video_id": [r[0] for r in rows],
+            "channel_id": [r[1] for r in rows],
+            "view_count": [r[2] for r in rows],
+            "like_count": [1] * len(rows),
+            "comment_count": [1] * len(rows),
+            "favorite_count": [0] * len(rows),
+            "snapshot_date": [date.fromisoformat(run_date)] * len(rows),
+        }
+    )
+
+
+def _channels(rows: list[tuple], run_date: str = "2025-01-02") -> pd.DataFrame:
+    """rows of (channel_id, subscriber_count)"""
+    return pd.DataFrame(
+        {
+            "channel_id": [r[0] for r in rows],
+            "view_count": [100] * len(rows),
+            "subscriber_count": [r[1] for r in rows],
+            "video_count": [10] * len(rows),
+            "snapshot_date": [date.fromisoformat(run_date)] * len(rows),
+        }
+    )
+
+
+def _stage(root, table: str, df: pd.DataFrame, run_date: str = "2025-01-02") -> str:
+    uri = storage.join_uri(str(root), "staging", table, f"run_date={run_date}", f"{table}.parquet")
+    storage.write_parquet(df, uri)
+    return uri
+
+
+def _area_dir(root, area: str, table: str, run_date: str = "2025-01-02"):
+    return root / area / table / f"run_date={run_date}"
+
+
+def _masks(videos: pd.DataFrame, previous: pd.DataFrame | None = None, channel_ids: list | None = None):
+    return _check_masks(
+        "videos",
+        pa.Table.from_pandas(videos, preserve_index=False),
+        None if previous is None else pa.Table.from_pandas(previous, preserve_index=False),
+        None if channel_ids is None else pa.array(channel_ids),
+    )
+
+
+def test_null_keys_mask():
+    masks = _masks(_videos([("v1", "A", 5), (None, "A", 5)]))
+    assert masks["null_keys"].tolist() == [False, True]
+
+
+def test_negative_counts_mask():
+    df = _videos([("v1", "A", 5), ("v2", "A", -1), ("v3", "A", 5)])
+    df.loc[2, "like_count"] = -3
+    assert _masks(df)["negative_counts"].tolist() == [False, True, True]
+
+
+def test_duplicate_keys_keep_first():
+    masks = _masks(_videos([("v1", "A", 5), ("v2", "A", 5), ("v1", "A", 7), ("v1", "A", 8)]))
+    assert masks["duplicate_keys"].tolist() == [False, False, True, True]
+
+    assert not _masks(_videos([("v1", "A", 5), ("v2", "A", 5)]))["duplicate_keys"].any()
+
+
+def test_view_count_decrease_mask():
+    previous = _videos([("v1", "A", 10), ("v2", "A", 10)], run_date="2025-01-01")
+    current = _videos([("v1", "A", 9), ("v2", "A", 10), ("v3", "A", 0)])
+
+    # v3 is new, so it has nothing to decrease from
+    assert _masks(current, previous=previous)["view_count_decrease"].tolist() == [True, False, False]
+    assert _masks(current)["view_count_decrease"] is None
+
+
+def test_orphan_channel_mask():
+    current = _videos([("v1", "A", 5), ("v2", "B", 5)])
+    assert _masks(current, channel_ids=["A"])["orphan_channel"].tolist() == [False, True]
+    assert _masks(current)["orphan_channel"] is None
+
+
+@pytest.mark.parametrize(
+    "severity, message",
+    [
+        ({"no_such_check": "warn"}, "Unknown data quality check"),
+        ({"null_keys": "drop"}, "must be one of"),
+    ],
+)
+def test_invalid_severity(tmp_path, severity, message):
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 5)]))
+    with pytest.raises(ValueError, match=message):
+        check_videos(staging, severity=severity)
+
+
+def test_clean_partition_passes(tmp_path):
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 5), ("v2", "A", 5)]))
+
+    report = check_videos(staging)
+
+    assert report["status"] == "passed"
+    assert report["quarantine_path"] is None
+    quality_dir = _area_dir(tmp_path, "quality", "videos")
+    assert (quality_dir / SUCCESS_MARKER).exists()
+    assert storage.read_json(str(quality_dir / "videos_report.json"))["status"] == "passed"
+    statuses = {r["check"]: r["status"] for r in report["checks"]}
+    assert statuses["view_count_decrease"] == "skipped"
+    assert statuses["orphan_channel"] == "skipped"
+
+
+def test_quarantine_rewrites_staging(tmp_path):
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 5), ("v2", "A", -1), ("v1", "A", 6)]))
+
+    report = check_videos(staging)
+
+    assert report["status"] == "quarantined"
+    assert report["quarantined_rows"] == 2
+    assert storage.read_parquet(staging)["video_id"].tolist() == ["v1"]
+
+    quarantined = storage.read_parquet(report["quarantine_path"])
+    assert quarantined["video_id"].tolist() == ["v2", "v1"]
+    assert quarantined["dq_failed_checks"].tolist() == ["negative_counts", "duplicate_keys"]
+
+    checks = {r["check"]: r for r in report["checks"]}
+    assert checks["negative_counts"]["sample"] == ["v2"]
+    assert (_area_dir(tmp_path, "quality", "videos") / SUCCESS_MARKER).exists()
+
+
+def test_warn_keeps_rows(tmp_path):
+    previous = _stage(tmp_path, "videos", _videos([("v1", "A", 10)], "2025-01-01"), "2025-01-01")
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 9)]))
+
+    report = check_videos(staging, previous_path=storage.parent_uri(previous))
+
+    assert report["status"] == "warned"
+    assert report["quarantined_rows"] == 0
+    assert storage.read_parquet(staging)["video_id"].tolist() == ["v1"]
+
+
+def test_previous_partition_with_mixed_dtype_shards(tmp_path):
+    base = storage.join_uri(str(tmp_path), "staging", "videos", "run_date=2025-01-01")
+    # A video without a viewCount makes this shard's view_count float64
+    storage.write_parquet(_videos([("v1", "A", 10)], "2025-01-01"), storage.join_uri(base, "shard=000", "videos.parquet"))
+    storage.write_parquet(
+        _videos([("v2", "B", 10), ("v3", "B", None)], "2025-01-01"),
+        storage.join_uri(base, "shard=001", "videos.parquet"),
+    )
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 11), ("v2", "B", 9)]))
+
+    report = check_videos(staging, previous_path=base)
+
+    checks = {r["check"]: r for r in report["checks"]}
+    assert checks["view_count_decrease"]["sample"] == ["v2"]
+
+
+def test_fail_quarantines_partition_and_raises(tmp_path):
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 5), ("v2", "A", -1)]))
+    quality_dir = _area_dir(tmp_path, "quality", "videos")
+    # Left over from an earlier successful check of the same partition
+    mark_success(str(quality_dir))
+
+    with pytest.raises(DataQualityError, match="negative_counts"):
+        check_videos(staging, severity={"negative_counts": "fail"})
+
+    assert not storage.exists(staging)
+    assert not (quality_dir / SUCCESS_MARKER).exists()
+    assert storage.read_json(str(quality_dir / "videos_report.json"))["status"] == "failed"
+
+    quarantined = storage.read_parquet(str(_area_dir(tmp_path, "quarantine", "videos") / "videos.parquet"))
+    assert quarantined["video_id"].tolist() == ["v1", "v2"]
+
+
+def test_check_after_failed_partition(tmp_path):
+    base = storage.join_uri(str(tmp_path), "staging", "videos")
+    _stage(tmp_path, "videos", _videos([("v1", "A", 10)], "2024-12-31"), "2024-12-31")
+    day1 = _stage(tmp_path, "videos", _videos([("v1", "A", -1)], "2025-01-01"), "2025-01-01")
+    with pytest.raises(DataQualityError):
+        check_videos(day1, severity={"negative_counts": "fail"})
+
+    # The emptied day 1 partition is skipped, day 2 compares with the day before
+    assert previous_partition(base, "2025-01-02") == storage.join_uri(base, "run_date=2024-12-31")
+    day2 = _stage(tmp_path, "videos", _videos([("v1", "A", 9)]))
+    report = check_videos(day2, previous_path=previous_partition(base, "2025-01-02"))
+    assert report["status"] == "warned"
+
+    # With no earlier data left the check is skipped rather than crashing
+    report = check_videos(day2, previous_path=storage.join_uri(base, "run_date=2025-01-01"))
+    statuses = {r["check"]: r["status"] for r in report["checks"]}
+    assert statuses["view_count_decrease"] == "skipped"
+    assert report["previous_partition"] is None
+
+
+def test_orphans_checked_against_all_channel_snapshots(tmp_path):
+    channels_base = storage.join_uri(str(tmp_path), "staging", "channels")
+    _stage(tmp_path, "channels", _channels([("A", 5), ("B", 5)], "2025-01-01"), "2025-01-01")
+    today = _stage(tmp_path, "channels", _channels([("A", 6), ("B", -1)]))
+
+    # B's row for today is quarantined ...
+    assert check_channels(today)["quarantined_rows"] == 1
+
+    # ... but build_warehouse still has B from yesterday, so its videos stay,
+    # while a channel never staged is an orphan
+    staging = _stage(tmp_path, "videos", _videos([("v1", "A", 5), ("v2", "B", 5), ("v3", "C", 5)]))
+    report = check_videos(staging, channels_path=channels_base)
+
+    assert storage.read_parquet(staging)["video_id"].tolist() == ["v1", "v2"]
+    assert storage.read_parquet(report["quarantine_path"])["video_id"].tolist() == ["v3"]
+
+
+@pytest.mark.parametrize(
+    "empty",
+    # With the staging schema, and without any columns as older transforms wrote it
+    [_videos([]), pd.DataFrame([])],
+    ids=["staging_schema", "no_columns"],
+)
+def test_empty_partition_passes(tmp_path, empty):
+    staging = _stage(tmp_path, "videos", empty)
+
+    report = check_videos(staging)
+
+    assert report["status"] == "passed"
+    assert report["row_count"] == 0
+    assert {r["status"] for r in report["checks"]} == {"skipped"}
+    assert (_area_dir(tmp_path, "quality", "videos") / SUCCESS_MARKER).exists()
@@ -0,0 +1,56 @@
+import pytest
+
+from extract.fetch_channels import fetch_channels
+from extract.fetch_videos import fetch_videos_for_channels
+from load.load_to_warehouse import build_warehouse
+from transform.transform_channels import transform_channels
+from transform.transform_videos import transform_videos
+from utils import storage
+from utils.partitions import partition_dir
+
+RUN_DATE = "2025-01-01"
+
+
+@pytest.fixture
+def data_root(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_API_BACKEND", "fake")
+    monkeypatch.setenv("PIPELINE_DATA_ROOT", str(tmp_path / "data"))
+    return tmp_path / "data"
+
+
+def _stage(channel_ids: list[str], shard: int):
+    channels_raw = fetch_channels(channel_ids, run_date=RUN_DATE)
+    videos_raw = fetch_videos_for_channels(channel_ids, run_date=RUN_DATE, max_videos_per_channel=3)
+    for table, transform, raw in [
+        ("channels", transform_channels, channels_raw),
+        ("videos", transform_videos, videos_raw),
+    ]:
+        out_dir = partition_dir(storage.data_uri("staging", table), RUN_DATE, shard)
+        transform(raw_file=raw, output_path=storage.join_uri(out_dir, f"{table}.parquet"))
+
+
+def _warehouse(table: str):
+    return storage.read_parquet(storage.data_uri("warehouse", f"{table}.parquet"))
+
+
+def test_build_warehouse(data_root):
+    _stage(["UC_channel_a", "UC_channel_b"], shard=0)
+    build_warehouse()
+
+    assert len(_warehouse("dim_channel")) == 2
+    assert len(_warehouse("dim_video")) == 6
+    assert len(_warehouse("fct_video_daily_stats")) == 6
+    assert _warehouse("dim_video")["channel_key"].notna().all()
+
+
+def test_facts_one_row_per_key_and_snapshot(data_root):
+    # The same snapshot staged twice, as when a date is re-run with other shards
+    _stage(["UC_channel_a", "UC_channel_b"], shard=0)
+    _stage(["UC_channel_b"], shard=1)
+    build_warehouse()
+
+    fct_channel = _warehouse("fct_channel_daily_stats")
+    fct_video = _warehouse("fct_video_daily_stats")
+    assert len(fct_channel) == 2
+    assert len(fct_video) == 6
+    assert not fct_video.duplicated(["video_key", "snapshot_date"]).any()
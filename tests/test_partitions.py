@@ -0,0 +1,50 @@
+import pandas as pd
+
+from utils import storage
+from utils.partitions import (
+    clear_partition,
+    is_complete,
+    mark_success,
+    missing_partitions,
+    partition_dir,
+    previous_partition,
+    run_date_from_path,
+)
+
+
+def test_partition_dir_and_run_date():
+    uri = partition_dir("s3://bucket/data/staging/videos", "2025-01-02", 3)
+    assert uri == "s3://bucket/data/staging/videos/run_date=2025-01-02/shard=003"
+    assert run_date_from_path(storage.join_uri(uri, "videos.parquet")) == "2025-01-02"
+
+
+def test_success_markers(tmp_path):
+    base = str(tmp_path / "quality" / "videos")
+    mark_success(partition_dir(base, "2025-01-02", 0))
+
+    assert is_complete(partition_dir(base, "2025-01-02", 0))
+    assert missing_partitions(base, "2025-01-02", [0, 1]) == [partition_dir(base, "2025-01-02", 1)]
+
+
+def test_clear_partition(tmp_path):
+    base = str(tmp_path / "staging" / "videos")
+    for run_date, shard in [("2025-01-01", 0), ("2025-01-02", 0), ("2025-01-02", 1)]:
+        storage.write_json([], storage.join_uri(partition_dir(base, run_date, shard), "videos.json"))
+
+    clear_partition(base, "2025-01-02")
+    # Clearing a run_date that was never written is a no-op
+    clear_partition(base, "2025-01-03")
+
+    assert storage.list_dir_names(base) == ["run_date=2025-01-01"]
+
+
+def test_previous_partition(tmp_path):
+    base = str(tmp_path / "staging" / "videos")
+    assert previous_partition(base, "2025-01-03") is None
+
+    storage.write_json([], storage.join_uri(partition_dir(base, "2025-01-01"), "videos.json"))
+    assert previous_partition(base, "2025-01-03") is None
+
+    storage.write_parquet(pd.DataFrame({"video_id": ["v1"]}), storage.join_uri(partition_dir(base, "2025-01-01"), "videos.parquet"))
+    storage.write_parquet(pd.DataFrame({"video_id": ["v1"]}), storage.join_uri(partition_dir(base, "2025-01-03"), "videos.parquet"))
+    assert previous_partition(base, "2025-01-03") == partition_dir(base, "2025-01-01")
@@ -0,0 +1,189 @@
+import socket
+
+import pandas as pd
+import pytest
+
+from utils import storage
+
+
+def _frame(start: int, rows: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(start, start + rows), "value": [float(i) for i in range(rows)]})
+
+
+def _write_partitions(root: str) -> str:
+    base = storage.join_uri(root, "staging", "videos")
+    storage.write_parquet(_frame(0), storage.join_uri(base, "run_date=2025-01-01", "shard=000", "videos.parquet"))
+    storage.write_parquet(_frame(3), storage.join_uri(base, "run_date=2025-01-01", "shard=001", "videos.parquet"))
+    storage.write_parquet(_frame(6), storage.join_uri(base, "run_date=2025-01-02", "shard=000", "videos.parquet"))
+    return base
+
+
+def test_join_uri():
+    assert storage.join_uri("data/", "/raw/", "channels") == "data/raw/channels"
+    assert storage.join_uri("s3://bucket/data", "warehouse", "dim_video.parquet") == (
+        "s3://bucket/data/warehouse/dim_video.parquet"
+    )
+
+
+def test_parent_uri():
+    assert storage.parent_uri("s3://bucket/data/warehouse/dim_video.parquet") == "s3://bucket/data/warehouse"
+    assert storage.parent_uri("data/raw/") == "data"
+    assert storage.parent_uri("videos.parquet") == "."
+
+
+def test_data_uri_uses_configured_root(monkeypatch):
+    monkeypatch.setenv("PIPELINE_DATA_ROOT", "s3://bucket/data/")
+    assert storage.data_uri("staging", "videos") == "s3://bucket/data/staging/videos"
+
+
+def test_write_parquet_creates_parent_dirs(tmp_path):
+    uri = storage.join_uri(str(tmp_path), "a", "b", "table.parquet")
+    storage.write_parquet(_frame(0), uri)
+
+    assert storage.exists(uri)
+    pd.testing.assert_frame_equal(storage.read_parquet(uri), _frame(0))
+
+
+def test_read_table_single_file(tmp_path):
+    uri = storage.join_uri(str(tmp_path), "table.parquet")
+    storage.write_parquet(_frame(0), uri)
+
+    table = storage.read_table(uri, columns=["id"])
+    assert table.column_names == ["id"]
+    assert table["id"].to_pylist() == [0, 1, 2]
+
+
+def test_read_table_partitioned_dir(tmp_path):
+    base = _write_partitions(str(tmp_path))
+
+    # Partitions are concatenated in path order
+    assert storage.read_table(base)["id"].to_pylist() == list(range(9))
+    assert storage.read_parquet(storage.join_uri(base, "run_date=2025-01-01"))["id"].tolist() == list(range(6))
+
+
+def test_read_table_mixed_dtype_partitions(tmp_path):
+    # A partition with a missing statistic stores the column as float64
+    base = storage.join_uri(str(tmp_path), "staging", "videos", "run_date=2025-01-01")
+    storage.write_parquet(
+        pd.DataFrame({"id": [0, 1], "like_count": [3, 4]}), storage.join_uri(base, "shard=000", "videos.parquet")
+    )
+    storage.write_parquet(
+        pd.DataFrame({"id": [2, 3], "like_count": [5, None]}), storage.join_uri(base, "shard=001", "videos.parquet")
+    )
+
+    df = storage.read_parquet(base)
+    assert df["id"].tolist() == [0, 1, 2, 3]
+    assert df["like_count"].dtype == "float64"
+    assert df["like_count"].tolist()[:3] == [3.0, 4.0, 5.0]
+    assert pd.isna(df["like_count"].iloc[3])
+
+
+def test_read_table_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        storage.read_table(storage.join_uri(str(tmp_path), "missing.parquet"))
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    with pytest.raises(FileNotFoundError):
+        storage.read_table(str(empty))
+
+
+def test_list_dir_names(tmp_path):
+    base = _write_partitions(str(tmp_path))
+    storage.write_json({}, storage.join_uri(base, "notes.json"))
+
+    assert sorted(storage.list_dir_names(base)) == ["run_date=2025-01-01", "run_date=2025-01-02"]
+
+
+def test_fingerprint_tracks_changes(tmp_path):
+    uri = storage.join_uri(str(tmp_path), "table.parquet")
+    missing = storage.fingerprint([uri])
+
+    storage.write_parquet(_frame(0), uri)
+    written = storage.fingerprint([uri])
+    assert written != missing
+    assert storage.fingerprint([uri]) == written
+
+    storage.write_parquet(_frame(0, rows=10), uri)
+    assert storage.fingerprint([uri]) != written
+
+
+def test_duckdb_s3_secret_static_keys(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "key")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "it's secret")
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+    monkeypatch.delenv("AWS_DEFAULT_REGION", raising=False)
+    monkeypatch.delenv("AWS_SESSION_TOKEN", raising=False)
+    monkeypatch.setenv("PIPELINE_S3_ENDPOINT_URL", "http://localhost:9000")
+
+    sql = storage._duckdb_s3_secret_sql()
+    assert "KEY_ID 'key'" in sql
+    assert "SECRET 'it''s secret'" in sql
+    assert "REGION 'eu-west-1'" in sql
+    assert "ENDPOINT 'localhost:9000'" in sql
+    assert "USE_SSL false" in sql
+    assert "PROVIDER" not in sql
+
+
+def test_duckdb_s3_secret_credential_chain(monkeypatch):
+    for name in ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION", "AWS_DEFAULT_REGION"]:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv("PIPELINE_S3_ENDPOINT_URL", raising=False)
+
+    assert storage._duckdb_s3_secret_sql() == (
+        "CREATE OR REPLACE SECRET pipeline_s3 (TYPE S3, PROVIDER credential_chain)"
+    )
+
+
+@pytest.fixture
+def s3_root(monkeypatch):
+    """A moto S3 bucket as the data root."""
+    moto_server = pytest.importorskip("moto.server")
+    boto3 = pytest.importorskip("boto3")
+    pytest.importorskip("s3fs")
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    # s3fs talks to S3 through aiobotocore, which moto's in-process mock
+    # cannot intercept, so serve the moto backend over HTTP instead
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+
+    endpoint_url = f"http://127.0.0.1:{port}"
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("PIPELINE_S3_ENDPOINT_URL", endpoint_url)
+    boto3.client("s3", endpoint_url=endpoint_url).create_bucket(Bucket="pipeline-test")
+
+    yield "s3://pipeline-test/data"
+    server.stop()
+
+
+def test_s3_round_trip(s3_root):
+    base = _write_partitions(s3_root)
+
+    assert sorted(storage.list_dir_names(base)) == ["run_date=2025-01-01", "run_date=2025-01-02"]
+    assert storage.read_table(base)["id"].to_pylist() == list(range(9))
+
+    uri = storage.join_uri(s3_root, "raw", "payload.json")
+    storage.write_json({"items": [1, 2]}, uri)
+    assert storage.read_json(uri) == {"items": [1, 2]}
+
+    first = storage.fingerprint([uri])
+    storage.write_json({"items": [1, 2, 3]}, uri)
+    assert storage.fingerprint([uri]) != first
+
+
+def test_duckdb_reads_s3_parquet(s3_root):
+    uri = storage.join_uri(s3_root, "warehouse", "dim_video.parquet")
+    storage.write_parquet(_frame(0, rows=5), uri)
+
+    # Either DuckDB's httpfs or the registered fsspec filesystem serves the read
+    con = storage.duckdb_connect(s3_root)
+    try:
+        assert con.execute(f"SELECT count(*), sum(id) FROM read_parquet('{uri}')").fetchone() == (5, 10)
+    finally:
+        con.close()
@@ -0,0 +1,55 @@
+import pytest
+
+from transform.transform_channels import transform_channels
+from transform.transform_videos import STAGING_COLUMNS, transform_videos
+from utils import storage
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    return storage.join_uri(str(tmp_path), "raw", "videos", "run_date=2025-01-02", "shard=000")
+
+
+def test_transform_videos(raw_dir):
+    raw_file = storage.join_uri(raw_dir, "videos.json")
+    storage.write_json(
+        [
+            {
+                "id": "v1",
+                "snippet": {"channelId": "A", "title": "t", "publishedAt": "2024-12-01T00:00:00Z"},
+                "contentDetails": {"duration": "PT1M5S"},
+                # Hidden likes and disabled comments leave these out
+                "statistics": {"viewCount": "10"},
+            }
+        ],
+        raw_file,
+    )
+    out = storage.join_uri(raw_dir.replace("/raw/", "/staging/"), "videos.parquet")
+
+    df = storage.read_parquet(transform_videos(raw_file=raw_file, output_path=out))
+
+    assert df["video_id"].tolist() == ["v1"]
+    assert df["duration_seconds"].tolist() == [65]
+    assert df["view_count"].tolist() == [10]
+    assert df["like_count"].isna().all()
+    assert str(df["snapshot_date"].iloc[0]) == "2025-01-02"
+
+
+def test_transform_empty_partition_keeps_schema(raw_dir):
+    # A shard whose channels have no public uploads
+    raw_file = storage.join_uri(raw_dir, "videos.json")
+    storage.write_json([], raw_file)
+    out = storage.join_uri(raw_dir.replace("/raw/", "/staging/"), "videos.parquet")
+
+    df = storage.read_parquet(transform_videos(raw_file=raw_file, output_path=out))
+
+    assert df.empty
+    assert list(df.columns) == STAGING_COLUMNS
+
+
+def test_transform_channels_empty_partition(tmp_path):
+    raw_file = storage.join_uri(str(tmp_path), "raw", "channels", "run_date=2025-01-02", "channels.json")
+    storage.write_json([], raw_file)
+    out = storage.join_uri(str(tmp_path), "staging", "channels", "run_date=2025-01-02", "channels.parquet")
+
+    assert storage.read_parquet(transform_channels(raw_file=raw_file, output_path=out)).empty